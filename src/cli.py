@@ -1,8 +1,8 @@
 import argparse
 import sys
-from rich.console import Console
 
-console = Console()
+# Rich and the GCP SDKs are imported only once arguments have parsed, so --help and
+# argument errors return without loading them.
 
 # TODO: Update banner for GKE/GCP
 def welcome_banner() -> None:
@@ -23,21 +23,27 @@ $$    $$/ $$ | $$  |$$       |      $$ |      $$ |$$ |  $$ |$$    $$/ $$    $$/
 [/]
 [bold bright_blue]GKE FinOps Dashboard CLI (v0.1.0)[/] # Updated Name/Version
 """
-    console.print(banner)
+    from rich.console import Console
+
+    Console().print(banner)
 
 
 # TODO: Update arguments for GCP (--projects, --locations)
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments for the GKE FinOps Dashboard."""
-    parser = argparse.ArgumentParser(description="GKE FinOps Dashboard CLI") # Updated description
+    # Flags are matched exactly: no prefix scan of every option string per token
+    parser = argparse.ArgumentParser(
+        description="GKE FinOps Dashboard CLI", # Updated description
+        allow_abbrev=False,
+    )
 
     parser.add_argument(
         "--projects", # Renamed from --profiles
         "-p",
         nargs="+",
-        help="Specific GCP Project IDs to use (space-separated)", # Updated help
+        help="Specific GCP Project IDs to use (space-separated). "
+        "Defaults to the comma-separated GKE_FINOPS_PROJECTS environment variable", # Updated help
         type=str,
-        required=True, # Made projects required for now
     )
     parser.add_argument(
         "--locations", # Renamed from --regions
@@ -82,11 +88,11 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
     """Command-line interface entry point."""
+    args = parse_args()
     welcome_banner()
     # Updated import path
     from gke_finops_dashboard.main import run_dashboard
 
-    args = parse_args()
     result = run_dashboard(args)
     return 0 if result == 0 else 1
 
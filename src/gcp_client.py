@@ -1,10 +1,17 @@
-from collections import defaultdict
-from typing import List, Optional
+import asyncio
+import dataclasses
+import functools
+import logging
+import os
+import threading
+import weakref
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, TypeVar
 
-# GCP Client Libraries
-from google.cloud import billing_v1
-from google.cloud import container_v1
+# GCP Client Libraries (the generated google.cloud API packages are imported lazily,
+# they pull in hundreds of modules and are not needed for --help or argument errors)
 from google.api_core import exceptions as google_exceptions
+from google.api_core import retry_async
 import google.auth
 
 # from boto3.session import Session # Will be replaced
@@ -13,43 +20,211 @@ from rich.console import Console
 # Updated import path and type names
 from gke_finops_dashboard.types import GKESummary, LocationName
 
+if TYPE_CHECKING:
+    import google.auth.credentials
+    from google.cloud import billing_v1, container_v1
+    from google.cloud.billing import budgets_v1
+
 console = Console()
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Upper bound on in-flight GCP RPCs per event loop, keeps fan-out under per-minute API quotas
+MAX_CONCURRENT_RPCS = 32
+
+# Retry quota/availability errors with exponential backoff instead of failing the project
+RPC_RETRY = retry_async.AsyncRetry(
+    predicate=retry_async.if_exception_type(
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+    ),
+    initial=1.0,
+    maximum=30.0,
+    multiplier=2.0,
+    timeout=120.0,
+)
+
+_rpc_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def rpc_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore bounding concurrent GCP RPCs on the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _rpc_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _rpc_semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_RPCS)
+    return semaphore
+
+
+@functools.lru_cache(maxsize=1)
+def _status_names() -> Dict[int, str]:
+    """Cluster status enum value -> GKESummary field name, avoids constructing the enum per cluster."""
+    from google.cloud import container_v1
+
+    summary_fields = {field.name for field in dataclasses.fields(GKESummary)}
+    names: Dict[int, str] = {}
+    for status in container_v1.Cluster.Status.__members__.values():
+        name = status.name.lower()
+        names[status.value] = name if name in summary_fields else "status_unspecified"
+    return names
+
+
+# Response field mask for list_clusters: only the fields the summary reads are sent
+# back, instead of full Cluster messages (node pools, addons, networking, ...)
+_LIST_CLUSTERS_METADATA = (("x-goog-fieldmask", "clusters.name,clusters.location,clusters.status"),)
+
+
+# All clients use the cloud-platform scope, so one set of credentials serves every API
+_CLOUD_PLATFORM_SCOPES = ("https://www.googleapis.com/auth/cloud-platform",)
+
+
+@functools.lru_cache(maxsize=1)
+def get_credentials() -> "google.auth.credentials.Credentials":
+    """Resolve Application Default Credentials once for all GCP API clients."""
+    credentials, _ = google.auth.default(scopes=_CLOUD_PLATFORM_SCOPES)
+    return credentials
+
+
+def verify_credentials() -> None:
+    """Resolve and refresh the shared credentials once, raising if they are unusable.
+
+    Called before projects are fanned out, so an authentication problem costs one
+    token request instead of one failed RPC per project.
+    """
+    from google.auth.transport.requests import Request
+
+    get_credentials().refresh(Request())
+
+
+# grpc.aio channels are bound to the event loop they were opened on, so clients are
+# cached per loop (like rpc_semaphore) and closed by close_clients() when a run ends
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Callable[..., Any], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _loop_client(client_cls: Callable[..., _T]) -> _T:
+    """Get the running event loop's `client_cls` client, creating it on first use."""
+    clients = _loop_clients.setdefault(asyncio.get_running_loop(), {})
+    if client_cls not in clients:
+        clients[client_cls] = client_cls(credentials=get_credentials())
+    client: _T = clients[client_cls]
+    return client
+
+
+async def close_clients() -> None:
+    """Close every GCP client opened on the running event loop."""
+    clients = _loop_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.transport.close()
+
+
+# Clients are shared by every project lookup on the same event loop
+def get_billing_client() -> "billing_v1.CloudBillingAsyncClient":
+    """Get the shared Cloud Billing client."""
+    from google.cloud import billing_v1
+
+    return _loop_client(billing_v1.CloudBillingAsyncClient)
+
+
+def get_budgets_client() -> "budgets_v1.BudgetServiceAsyncClient":
+    """Get the shared Billing Budgets client."""
+    from google.cloud.billing import budgets_v1
+
+    return _loop_client(budgets_v1.BudgetServiceAsyncClient)
+
+
+def get_container_client() -> "container_v1.ClusterManagerAsyncClient":
+    """Get the shared GKE cluster manager client."""
+    from google.cloud import container_v1
+
+    return _loop_client(container_v1.ClusterManagerAsyncClient)
+
+
+# project_id -> billing account name (None when billing is disabled)
+_billing_account_cache: Dict[str, Optional[str]] = {}
+
+# Billing account applied to every project, skipping per-project discovery when set
+BILLING_ACCOUNT_ENV_VARS = ("GCP_BILLING_ACCOUNT", "GOOGLE_BILLING_ACCOUNT")
+
+
+def clear_billing_cache() -> None:
+    """Forget all cached project billing account lookups."""
+    _billing_account_cache.clear()
 
 
 # --- Functions below will be completely refactored for GCP ---
 
-# Placeholder for GCP project/credential handling
-def get_gcp_projects() -> List[str]:
-    """Placeholder: Get configured GCP projects."""
-    console.print("[bold yellow]Placeholder: get_gcp_projects not implemented[/]")
-    return ["your-gcp-project-id"]
+# Comma-separated project IDs used when --projects is not given. Commas rather than
+# colons: legacy domain-scoped project IDs ("example.com:my-project") contain a colon.
+PROJECTS_ENV_VAR = "GKE_FINOPS_PROJECTS"
+
+_projects_cache: Optional[List[str]] = None
+_projects_lock = threading.Lock()
+
+
+def get_gcp_projects(projects: Optional[List[str]] = None) -> List[str]:
+    """Get the GCP projects to report on.
+
+    Explicitly passed projects (e.g. --projects) are used as-is. Otherwise the list is
+    read once from the GKE_FINOPS_PROJECTS environment variable, without any API call.
+    """
+    if projects:
+        return list(projects)
+    global _projects_cache
+    with _projects_lock:
+        if _projects_cache is None:
+            raw_projects = os.environ.get(PROJECTS_ENV_VAR, "")
+            _projects_cache = [p.strip() for p in raw_projects.split(",") if p.strip()]
+        return list(_projects_cache)
 
 
 # Placeholder for getting billing account associated with a project
-def get_billing_account_for_project(project_id: str) -> Optional[str]:
-    """Get the billing account name associated with a GCP project."""
+async def get_billing_account_for_project(project_id: str) -> Optional[str]:
+    """Get the billing account name associated with a GCP project (cached per project).
+
+    GCP_BILLING_ACCOUNT or GOOGLE_BILLING_ACCOUNT, when set, is used for every project
+    without calling the Cloud Billing API.
+    """
+    for env_var in BILLING_ACCOUNT_ENV_VARS:
+        billing_account = os.environ.get(env_var, "").strip()
+        if billing_account:
+            if not billing_account.startswith("billingAccounts/"):
+                billing_account = f"billingAccounts/{billing_account}"
+            return billing_account
+    if project_id in _billing_account_cache:
+        return _billing_account_cache[project_id]
     try:
-        billing_client = billing_v1.CloudBillingClient()
+        billing_client = get_billing_client()
         project_name = f"projects/{project_id}"
-        project_billing_info = billing_client.get_project_billing_info(name=project_name)
+        async with rpc_semaphore():
+            project_billing_info = await billing_client.get_project_billing_info(
+                name=project_name, retry=RPC_RETRY
+            )
 
+        billing_account_name: Optional[str] = None
         if project_billing_info.billing_enabled:
-            return project_billing_info.billing_account_name
+            billing_account_name = project_billing_info.billing_account_name
         else:
-            console.log(f"[yellow]Billing is not enabled for project {project_id}[/]")
-            return None
+            logger.warning("Billing is not enabled for project %s", project_id)
+        # Only successful lookups are cached; errors are retried on the next call
+        _billing_account_cache[project_id] = billing_account_name
+        return billing_account_name
     except google_exceptions.NotFound:
-        console.log(f"[yellow]Project {project_id} not found or access denied.[/]")
+        logger.warning("Project %s not found or access denied.", project_id)
         return None
     except google_exceptions.PermissionDenied:
-        console.log(f"[yellow]Permission denied to get billing info for project {project_id}. Check IAM roles (e.g., roles/billing.viewer).[/]")
+        logger.warning("Permission denied to get billing info for project %s. Check IAM roles (e.g., roles/billing.viewer).", project_id)
         return None
     except google.auth.exceptions.DefaultCredentialsError:
          # This exception might be caught higher up, but good to be specific
-         console.log(f"[bold red]GCP authentication failed. Run 'gcloud auth application-default login'.[/]")
+         logger.error("GCP authentication failed. Run 'gcloud auth application-default login'.")
          raise # Re-raise to be handled by the main loop
     except Exception as e:
-        console.log(f"[bold red]Error getting billing account for project {project_id}: {str(e)}[/]")
+        logger.error("Error getting billing account for project %s: %s", project_id, e)
         return None
 
 
@@ -70,55 +245,99 @@ def get_accessible_locations(project_id: str) -> List[LocationName]:
     return ["us-central1", "europe-west1"]
 
 
-def get_gke_summary(
+async def _list_clusters_all(
+    container_client: "container_v1.ClusterManagerAsyncClient", project_id: str
+) -> Sequence["container_v1.Cluster"]:
+    """List the project's clusters in every location with a single "-" wildcard call."""
+    async with rpc_semaphore():
+        response = await container_client.list_clusters(
+            parent=f"projects/{project_id}/locations/-",
+            retry=RPC_RETRY,
+            metadata=_LIST_CLUSTERS_METADATA,
+        )
+    return response.clusters
+
+
+async def _list_clusters_one_location(
+    container_client: "container_v1.ClusterManagerAsyncClient",
+    project_id: str,
+    loc: LocationName,
+    cluster_summary: "Counter[str]",
+) -> Sequence["container_v1.Cluster"]:
+    """List clusters in a single location; failures are logged and yield no clusters."""
+    parent = f"projects/{project_id}/locations/{loc}"
+    try:
+        async with rpc_semaphore():
+            response = await container_client.list_clusters(
+                parent=parent, retry=RPC_RETRY, metadata=_LIST_CLUSTERS_METADATA
+            )
+        return response.clusters
+    except google_exceptions.NotFound:
+         # This might happen if a specific location is invalid or has no GKE resources/permissions
+         logger.warning("No GKE clusters found or access denied in location '%s' for project %s.", loc, project_id)
+    except google_exceptions.PermissionDenied:
+         # Other requested locations are unaffected, keep going
+         logger.warning("Permission denied for GKE in location '%s' for project %s. Check IAM roles (e.g., roles/container.viewer).", loc, project_id)
+    except Exception as loc_e:
+         # Catch other potential errors per location
+         logger.error("Error listing GKE clusters in location '%s' for project %s: %s", loc, project_id, loc_e)
+         cluster_summary["error"] += 1 # Generic error count
+    return []
+
+
+async def get_gke_summary(
     project_id: str, locations: Optional[List[LocationName]] = None
 ) -> GKESummary:
     """Get GKE cluster summary across specified locations or all locations."""
-    cluster_summary: GKESummary = defaultdict(int)
+    # Tallied by GKESummary field name, then turned into the summary once at the end
+    cluster_summary: "Counter[str]" = Counter()
     try:
-        container_client = container_v1.ClusterManagerClient()
-        
-        locations_to_check = locations if locations else ["-"] # Use "-" to check all locations if none specified
-
-        for loc in locations_to_check:
-            parent = f"projects/{project_id}/locations/{loc}"
-            try:
-                response = container_client.list_clusters(parent=parent)
-                for cluster in response.clusters:
-                    # Status is an enum, get its name
-                    status_name = container_v1.Cluster.Status(cluster.status).name
-                    cluster_summary[status_name] += 1
-            except google_exceptions.NotFound:
-                 # This might happen if a specific location is invalid or has no GKE resources/permissions
-                 console.log(f"[yellow]No GKE clusters found or access denied in location '{loc}' for project {project_id}.[/]")
-                 continue # Continue to the next location
-            except google_exceptions.PermissionDenied:
-                 console.log(f"[yellow]Permission denied for GKE in location '{loc}' for project {project_id}. Check IAM roles (e.g., roles/container.viewer).[/]")
-                 # If checking all locations ("-"), permission denied might stop the whole process.
-                 # If checking specific locations, we can continue.
-                 if loc == "-":
-                     cluster_summary["PERMISSION_DENIED"] += 1 # Mark as permission denied
-                     break # Stop checking other locations if wildcard fails on permissions
-                 else:
-                     continue
-            except Exception as loc_e:
-                 # Catch other potential errors per location
-                 console.log(f"[bold red]Error listing GKE clusters in location '{loc}' for project {project_id}: {str(loc_e)}[/]")
-                 cluster_summary["ERROR"] += 1 # Generic error count
-
-        if not cluster_summary and locations_to_check != ["-"]:
+        container_client = get_container_client()
+
+        # A single list on the "-" wildcard returns clusters from every location;
+        # requested locations are filtered client-side instead of one RPC each.
+        wanted_locations = set(locations) if locations else None
+        clusters: Sequence["container_v1.Cluster"] = []
+        try:
+            clusters = await _list_clusters_all(container_client, project_id)
+            if wanted_locations is not None:
+                # A zonal cluster (us-central1-a) belongs to its region (us-central1) too
+                clusters = [
+                    cluster
+                    for cluster in clusters
+                    if cluster.location in wanted_locations
+                    or cluster.location.rsplit("-", 1)[0] in wanted_locations
+                ]
+        except google_exceptions.NotFound:
+             logger.warning("No GKE clusters found or access denied for project %s.", project_id)
+        except google_exceptions.PermissionDenied:
+             if wanted_locations is None:
+                 logger.warning("Permission denied for GKE in project %s. Check IAM roles (e.g., roles/container.viewer).", project_id)
+                 cluster_summary["permission_denied"] += 1 # Mark as permission denied
+             else:
+                 # Access may be restricted to some locations only; query the requested
+                 # locations individually so the denied ones can be isolated.
+                 per_location = await asyncio.gather(
+                     *(
+                         _list_clusters_one_location(container_client, project_id, loc, cluster_summary)
+                         for loc in wanted_locations
+                     )
+                 )
+                 clusters = [cluster for loc_clusters in per_location for cluster in loc_clusters]
+
+        # Counter.update tallies the status names without a Python-level loop body
+        status_names = _status_names()
+        cluster_summary.update(status_names.get(cluster.status, "status_unspecified") for cluster in clusters)
+
+        if not cluster_summary and wanted_locations is not None:
              # If specific locations were given but none yielded results or errors
-             console.log(f"[yellow]No GKE clusters found in specified locations for project {project_id}.[/]")
+             logger.warning("No GKE clusters found in specified locations for project %s.", project_id)
 
     except google.auth.exceptions.DefaultCredentialsError:
-         console.log(f"[bold red]GCP authentication failed. Run 'gcloud auth application-default login'.[/]")
+         logger.error("GCP authentication failed. Run 'gcloud auth application-default login'.")
          raise # Re-raise to be handled by the main loop
     except Exception as e:
-        console.log(f"[bold red]Error initializing GKE client or processing locations for project {project_id}: {str(e)}[/]")
-        cluster_summary["ERROR"] += 1 # Add to generic error count
-
-    # Ensure common statuses exist, even if zero, for consistent reporting
-    if "RUNNING" not in cluster_summary: cluster_summary["RUNNING"] = 0
-    if "STOPPED" not in cluster_summary: cluster_summary["STOPPED"] = 0 # Note: GKE uses STOPPING state during deletion
+        logger.error("Error initializing GKE client or processing locations for project %s: %s", project_id, e)
+        cluster_summary["error"] += 1 # Add to generic error count
 
-    return cluster_summary
\ No newline at end of file
+    return GKESummary(**cluster_summary)
\ No newline at end of file
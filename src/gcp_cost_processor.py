@@ -1,58 +1,66 @@
 import csv
+import dataclasses
+import functools
 import json
+import logging
+import operator
 import os
 from datetime import date, datetime, timedelta
-from typing import List, Optional, Tuple, Dict, Any # Added Dict, Any
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING, BinaryIO, Iterable, List, TextIO, Optional, Tuple, Dict, Any # Added Dict, Any
 
 from collections import defaultdict
 
-# GCP Client Libraries
-from google.cloud import billing_v1
-from google.cloud.billing import budgets_v1
-from google.protobuf.json_format import MessageToDict # To help inspect budget object
+# GCP Client Libraries (generated API packages are imported where used)
 from google.api_core import exceptions as google_exceptions
 import google.auth
-from decimal import Decimal # For handling money values from API
 
 from rich.console import Console
 
-# Updated import paths and type names
-from gke_finops_dashboard.gcp_client import get_billing_account_for_project
-from gke_finops_dashboard.types import GCPBudgetInfo, GCPCostData, GKESummary, ProjectData
+try:
+    # Optional: much faster JSON serialization (pip install gke-finops-dashboard[fast])
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None  # type: ignore[assignment]
 
-# Import Money type
-from google.type.money_pb2 import Money
+# Updated import paths and type names
+from gke_finops_dashboard.gcp_client import RPC_RETRY, get_budgets_client, rpc_semaphore
+from gke_finops_dashboard.types import (
+    GCPBudgetInfo,
+    GCPCostData,
+    GKESummary,
+    PeriodWindow,
+    ProjectData,
+)
+
+if TYPE_CHECKING:
+    from google.cloud.billing import budgets_v1
+    from google.type.money_pb2 import Money
 
 console = Console()
+logger = logging.getLogger(__name__)
 
 
 # --- Functions below will be completely refactored for GCP ---
 
 # Placeholder for GCP cost data fetching
-def _money_to_float(money: Optional[Money]) -> float:
-    """Converts Google's Money proto to float, handling None."""
-    if money is None or money.units is None:
-        return 0.0
-    # Combine units and nanos into a Decimal for precision, then convert to float
-    value = Decimal(money.units) + (Decimal(money.nanos or 0) / Decimal("1e9"))
-    return float(value)
-
-def get_gcp_cost_data(project_id: str, billing_account_name: str, time_range: Optional[int] = None) -> GCPCostData:
-    """
-    Get cost and budget data for a GCP project using Budgets API.
+def _money_to_cents(money: Optional["Money"]) -> int:
+    """Converts Google's Money proto to whole cents (half-up), handling None.
 
-    Limitation: Without BigQuery, arbitrary time_range cost calculation is not
-    feasible via Billing API. This function uses the 'last_period_amount' from the
-    *first* budget found as a proxy for current period cost and sets previous
-    period cost to 0. Budget data reflects the state reported by the Budgets API.
+    This is the only place amounts are rounded; everything downstream is integer cents.
     """
-    budgets_client = budgets_v1.BudgetServiceClient()
-    budgets_data: List[GCPBudgetInfo] = []
-    current_period_cost_proxy = 0.0
-    previous_period_cost_proxy = 0.0 # Cannot reliably get this without BigQuery
+    if money is None:
+        return 0
+    amount = Decimal(money.units) + Decimal(money.nanos).scaleb(-9)
+    return int(amount.scaleb(2).quantize(Decimal(1), rounding=ROUND_HALF_UP))
 
-    # Calculate date ranges for metadata, even if not used for cost fetching
-    today = date.today()
+
+@functools.lru_cache(maxsize=4)
+def _compute_period_window(time_range: Optional[int], today: date) -> PeriodWindow:
+    """Compute the current/previous reporting periods ending on `today`.
+
+    Cached: every project in a run shares the same time range and date.
+    """
     if time_range:
         end_date = today
         start_date = today - timedelta(days=time_range)
@@ -67,133 +75,196 @@ def get_gcp_cost_data(project_id: str, billing_account_name: str, time_range: Op
         previous_period_start = previous_period_end.replace(day=1)
         current_period_name = "Current month"
         previous_period_name = "Last month"
+    return PeriodWindow(
+        current_period_name=current_period_name,
+        previous_period_name=previous_period_name,
+        current_period_start=start_date,
+        current_period_end=end_date,
+        previous_period_start=previous_period_start,
+        previous_period_end=previous_period_end,
+    )
+
+
+def get_period_window(time_range: Optional[int] = None) -> PeriodWindow:
+    """Get the current/previous reporting periods for `time_range`, ending today."""
+    return _compute_period_window(time_range, date.today())
+
+
+def _to_budget_info(budget: "budgets_v1.Budget") -> GCPBudgetInfo:
+    """Extract the displayed details of a Budgets API budget."""
+    budget_name = budget.display_name or budget.name.split('/')[-1] # Use display name or resource name part
+
+    limit_cents = 0
+    if budget.amount and budget.amount.specified_amount:
+         limit_cents = _money_to_cents(budget.amount.specified_amount.amount)
+    elif budget.amount and budget.amount.last_period_amount:
+         # If budget is based on last period's spend
+         limit_cents = _money_to_cents(budget.amount.last_period_amount.amount)
+         budget_name += " (based on last period)"
+
+    actual_cents = _money_to_cents(budget.last_period_amount.amount if budget.last_period_amount else None)
+    forecast_cents = _money_to_cents(budget.forecasted_spend.amount if budget.forecasted_spend else None)
+
+    return GCPBudgetInfo(
+        name=budget_name,
+        limit_cents=limit_cents,
+        actual_cents=actual_cents,
+        forecast_cents=forecast_cents if forecast_cents > 0 else None,
+    )
+
+
+async def _fetch_all_budgets(billing_account_name: str) -> List[GCPBudgetInfo]:
+    """Fetch every budget of the billing account."""
+    from google.cloud.billing import budgets_v1
+
+    # Pages are chained by next_page_token, so they can only be fetched in
+    # sequence; large pages keep the number of round trips down.
+    request = budgets_v1.ListBudgetsRequest(parent=billing_account_name, page_size=100)
+    async with rpc_semaphore():
+        pager = await get_budgets_client().list_budgets(request=request, retry=RPC_RETRY)
+        return [_to_budget_info(budget) async for budget in pager]
+
+
+async def get_gcp_cost_data(project_id: str, billing_account_name: str, time_range: Optional[int] = None) -> GCPCostData:
+    """
+    Get cost and budget data for a GCP project using Budgets API.
+
+    Limitation: Without BigQuery, arbitrary time_range cost calculation is not
+    feasible via Billing API. This function uses the 'last_period_amount' from the
+    *first* budget found as a proxy for current period cost and sets previous
+    period cost to 0. Budget data reflects the state reported by the Budgets API.
+    """
+    budgets_data: List[GCPBudgetInfo] = []
+    current_period_cents_proxy = 0
+    previous_period_cents_proxy = 0 # Cannot reliably get this without BigQuery
+
+    # Calculate date ranges for metadata, even if not used for cost fetching
+    period = get_period_window(time_range)
 
     try:
-        request = budgets_v1.ListBudgetsRequest(parent=billing_account_name)
-        budgets_list = budgets_client.list_budgets(request=request)
-
-        first_budget = True
-        for budget in budgets_list:
-            # Extract budget details
-            budget_name = budget.display_name or budget.name.split('/')[-1] # Use display name or resource name part
-            
-            limit_amount = 0.0
-            if budget.amount and budget.amount.specified_amount:
-                 limit_amount = _money_to_float(budget.amount.specified_amount.amount)
-            elif budget.amount and budget.amount.last_period_amount:
-                 # If budget is based on last period's spend
-                 limit_amount = _money_to_float(budget.amount.last_period_amount.amount)
-                 budget_name += " (based on last period)"
-
-
-            actual_spend = _money_to_float(budget.last_period_amount.amount if budget.last_period_amount else None)
-            forecasted_spend = _money_to_float(budget.forecasted_spend.amount if budget.forecasted_spend else None)
-
-            budgets_data.append({
-                "name": budget_name,
-                "limit": limit_amount,
-                "actual": actual_spend,
-                "forecast": forecasted_spend if forecasted_spend > 0 else None,
-            })
-
-            # Use first budget's actual spend as proxy for current period cost
-            if first_budget:
-                current_period_cost_proxy = actual_spend
-                first_budget = False
-                console.log(f"[yellow]Using actual spend from budget '{budget_name}' (${actual_spend:.2f}) as proxy for current period cost.[/]")
+        budgets_data = await _fetch_all_budgets(billing_account_name)
+
+        # Use first budget's actual spend as proxy for current period cost
+        if budgets_data:
+            current_period_cents_proxy = budgets_data[0].actual_cents
+            logger.info("Using actual spend from budget '%s' (%s) as proxy for current period cost.", budgets_data[0].name, format_cents(current_period_cents_proxy))
 
     except google_exceptions.PermissionDenied:
-        console.log(f"[yellow]Permission denied to list budgets for {billing_account_name}. Check IAM roles (e.g., roles/billing.budgetsViewer).[/]")
+        logger.warning("Permission denied to list budgets for %s. Check IAM roles (e.g., roles/billing.budgetsViewer).", billing_account_name)
     except google.auth.exceptions.DefaultCredentialsError:
-         console.log(f"[bold red]GCP authentication failed. Run 'gcloud auth application-default login'.[/]")
+         logger.error("GCP authentication failed. Run 'gcloud auth application-default login'.")
          raise # Re-raise
     except Exception as e:
-        console.log(f"[bold red]Error getting budget data for {billing_account_name}: {str(e)}[/]")
+        logger.error("Error getting budget data for %s: %s", billing_account_name, e)
 
     if not budgets_data:
-         console.log(f"[yellow]No budgets found for billing account {billing_account_name}. Cost data will be limited.[/]")
+         logger.warning("No budgets found for billing account %s. Cost data will be limited.", billing_account_name)
 
     # --- Cost Fetching (Approximation) ---
     # As noted, we use the budget's actual spend as a proxy.
     # No separate Billing API call for cost is made here due to limitations.
-    console.log("[yellow]Warning: Cost data is approximated based on budget's actual spend. Enable BigQuery export for accurate time-range costs.[/]")
-
-
-    return {
-        "project_id": project_id,
-        "current_period_cost": current_period_cost_proxy,
-        "previous_period_cost": previous_period_cost_proxy, # Set to 0
-        "cost_by_service": [], # Cannot get service breakdown from Budgets API
-        "budgets": budgets_data,
-        "current_period_name": current_period_name,
-        "previous_period_name": previous_period_name,
-        "time_range": time_range,
-        "current_period_start": start_date.isoformat(),
-        "current_period_end": end_date.isoformat(),
-        "previous_period_start": previous_period_start.isoformat(),
-        "previous_period_end": previous_period_end.isoformat(),
-    }
+    # Informational only: the table caption already states costs are approximated
+    logger.info("Cost data is approximated based on budget's actual spend. Enable BigQuery export for accurate time-range costs.")
+
+
+    return GCPCostData(
+        project_id=project_id,
+        current_period_cents=current_period_cents_proxy,
+        previous_period_cents=previous_period_cents_proxy, # Set to 0
+        cost_by_service=[], # Cannot get service breakdown from Budgets API
+        budgets=budgets_data,
+        current_period_name=period.current_period_name,
+        previous_period_name=period.previous_period_name,
+        time_range=time_range,
+        current_period_start=period.current_period_start.isoformat(),
+        current_period_end=period.current_period_end.isoformat(),
+        previous_period_start=period.previous_period_start.isoformat(),
+        previous_period_end=period.previous_period_end.isoformat(),
+    )
 
 
 def process_gcp_costs(
     cost_data: GCPCostData,
-) -> Tuple[List[str], List[Tuple[str, float]]]:
-    """Process and format GCP costs (currently total project cost proxy)."""
-    total_cost = cost_data["current_period_cost"]
+) -> Tuple[List[str], List[Tuple[str, int]]]:
+    """Process and format GCP costs (currently total project cost proxy), in cents."""
+    total_cents = cost_data.current_period_cents
     # Since we only have total cost proxy, the breakdown is simple
-    if total_cost > 0.001:
-        formatted_costs = [f"Total Project Cost (Proxy): ${total_cost:.2f}"]
-        cost_data_tuples = [("Total Project Cost (Proxy)", total_cost)]
+    if total_cents > 0:
+        formatted_costs = [f"Total Project Cost (Proxy): {format_cents(total_cents)}"]
+        cost_data_tuples = [("Total Project Cost (Proxy)", total_cents)]
     else:
         formatted_costs = ["No significant cost detected (based on budget proxy)."]
         cost_data_tuples = []
     return formatted_costs, cost_data_tuples
 
 
+def format_cents(cents: int) -> str:
+    """Format a whole number of cents as "$1234.56" ("-$1.50" for credits)."""
+    sign = "-" if cents < 0 else ""
+    dollars, remainder = divmod(abs(cents), 100)
+    return f"{sign}${dollars}.{remainder:02d}"
+
+
 def format_gcp_budget_info(budgets: List[GCPBudgetInfo]) -> List[str]:
     """Format GCP budget information for display."""
-    budget_info_lines: List[str] = []
     if not budgets:
         return ["No budgets found or accessible."]
+    budget_info_lines: List[str] = []
+    extend = budget_info_lines.extend
     for budget in budgets:
-        limit_str = f"${budget['limit']:.2f}" if budget['limit'] > 0 else "N/A (e.g., based on last period)"
-        budget_info_lines.append(f"[bold]{budget['name']}[/]")
-        budget_info_lines.append(f"  Limit: {limit_str}")
-        budget_info_lines.append(f"  Actual: ${budget['actual']:.2f}")
-        if budget.get('forecast') is not None:
-             budget_info_lines.append(f"  Forecast: ${budget['forecast']:.2f}")
-        budget_info_lines.append("") # Add spacing between budgets
-    # Remove trailing empty line if budgets were processed
-    if budget_info_lines:
-        budget_info_lines.pop()
+        limit_str = format_cents(budget.limit_cents) if budget.limit_cents > 0 else "N/A (e.g., based on last period)"
+        # Each budget block starts with a blank spacer line; the leading one is dropped below
+        extend(
+            (
+                "",
+                f"[bold]{budget.name}[/]",
+                f"  Limit: {limit_str}",
+                f"  Actual: {format_cents(budget.actual_cents)}",
+            )
+        )
+        if budget.forecast_cents is not None:
+             budget_info_lines.append(f"  Forecast: {format_cents(budget.forecast_cents)}")
+    del budget_info_lines[0]
     return budget_info_lines
 
 
+# Colors for GKE states, keyed by GKESummary field
+_STATUS_COLORS = {
+    "running": "bright_green",
+    "provisioning": "bright_cyan",
+    "reconciling": "cyan",
+    "stopping": "bright_yellow",
+    "degraded": "yellow",
+    "error": "bright_red",
+    "status_unspecified": "dim",
+    "permission_denied": "red", # Custom status added in gcp_client
+}
+# GKESummary fields in display order (alphabetical by state name)
+_GKE_STATUS_FIELDS = sorted(field.name for field in dataclasses.fields(GKESummary))
+# Pre-rendered "[color]STATE: {}[/]" line templates per state
+_STATUS_FMT = {
+    state: f"[{_STATUS_COLORS[state]}]{state.upper()}: {{}}[/]"
+    for state in _GKE_STATUS_FIELDS
+}
+
+
+def _gke_status_counts(gke_data: GKESummary) -> List[Tuple[str, int]]:
+    """Non-zero (field name, count) pairs of a GKE summary, in display order."""
+    counts = [(state, getattr(gke_data, state)) for state in _GKE_STATUS_FIELDS]
+    return [(state, count) for state, count in counts if count > 0]
+
+
 def format_gke_summary(gke_data: GKESummary) -> List[str]:
     """Format GKE cluster summary for display."""
-    gke_summary_lines: List[str] = []
-    # Define colors for GKE states
-    status_colors = {
-        "RUNNING": "bright_green",
-        "PROVISIONING": "bright_cyan",
-        "RECONCILING": "cyan",
-        "STOPPING": "bright_yellow",
-        "DEGRADED": "yellow",
-        "ERROR": "bright_red",
-        "STATUS_UNSPECIFIED": "dim",
-        "PERMISSION_DENIED": "red", # Custom status added in gcp_client
-    }
-
-    for state, count in sorted(gke_data.items()):
-        if count > 0:
-            state_color = status_colors.get(state, "white") # Default to white if unknown
-            gke_summary_lines.append(f"[{state_color}]{state}: {count}[/]")
+    gke_summary_lines = [
+        _STATUS_FMT[state].format(count) for state, count in _gke_status_counts(gke_data)
+    ]
 
     if not gke_summary_lines:
         # Check if there was an error state captured
-        if gke_data.get("ERROR", 0) > 0:
+        if gke_data.error > 0:
              gke_summary_lines = ["[red]Error fetching GKE data[/]"]
-        elif gke_data.get("PERMISSION_DENIED", 0) > 0:
+        elif gke_data.permission_denied > 0:
              gke_summary_lines = ["[red]Permission Denied for GKE[/]"]
         else:
              gke_summary_lines = ["No GKE clusters found or accessible."]
@@ -201,9 +272,57 @@ def format_gke_summary(gke_data: GKESummary) -> List[str]:
     return gke_summary_lines
 
 
+# Row fields used by the CSV export, fetched together in a single C-level call
+_CSV_ROW_FIELDS = operator.attrgetter(
+    "project_id", "previous_period_cents", "current_period_cents", "budget_info", "gke_summary"
+)
+
+
+def write_csv(
+    csvfile: TextIO,
+    data: Iterable[ProjectData],
+    previous_period_dates: str = "N/A",
+    current_period_dates: str = "N/A",
+) -> None:
+    """Write dashboard rows as CSV to an open text file, one row at a time."""
+    previous_period_header = f"Cost for period\n({previous_period_dates})"
+    current_period_header = f"Cost for period\n({current_period_dates})"
+
+    # TODO: Update fieldnames for GCP/GKE
+    writer = csv.writer(csvfile)
+    writer.writerow(
+        (
+            "GCP Project ID", # Updated
+            previous_period_header,
+            current_period_header,
+            "Total Project Cost", # Updated
+            "Budget Status",
+            "GKE Cluster Status", # Updated
+        )
+    )
+    writerow = writer.writerow
+    for project_id, previous_cost, current_cost, budget_info, gke_summary in map(
+        _CSV_ROW_FIELDS, data
+    ):
+        # TODO: Update data mapping for GCP/GKE
+        current_cost_str = format_cents(current_cost)
+        writerow(
+            (
+                project_id,
+                format_cents(previous_cost),
+                current_cost_str,
+                current_cost_str, # Total cost simplified to current period cost
+                budget_info or "No budgets",
+                "\n".join(
+                    [f"{state.upper()}: {count}" for state, count in _gke_status_counts(gke_summary)]
+                ) or "No clusters",
+            )
+        )
+
+
 # Placeholder for CSV export (needs updated headers/data)
 def export_to_csv(
-    data: List[ProjectData],
+    data: Iterable[ProjectData],
     filename: str,
     output_dir: Optional[str] = None,
     previous_period_dates: str = "N/A",
@@ -221,38 +340,9 @@ def export_to_csv(
         else:
             output_filename = base_filename
 
-        previous_period_header = f"Cost for period\n({previous_period_dates})"
-        current_period_header = f"Cost for period\n({current_period_dates})"
-
-        with open(output_filename, "w", newline="") as csvfile:
-            # TODO: Update fieldnames for GCP/GKE
-            fieldnames = [
-                "GCP Project ID", # Updated
-                previous_period_header,
-                current_period_header,
-                "Total Project Cost", # Updated
-                "Budget Status",
-                "GKE Cluster Status", # Updated
-            ]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in data:
-                # TODO: Update data mapping for GCP/GKE
-                budgets_data = "\n".join(row["budget_info"]) if row["budget_info"] else "No budgets"
-                gke_data_summary = "\n".join(
-                    [f"{state}: {count}" for state, count in row["gke_summary"].items() if count > 0]
-                )
-
-                writer.writerow(
-                    {
-                        "GCP Project ID": row["project_id"],
-                        previous_period_header: f"${row['previous_period_cost']:.2f}",
-                        current_period_header: f"${row['current_period_cost']:.2f}",
-                        "Total Project Cost": f"${row['current_period_cost']:.2f}", # Simplified
-                        "Budget Status": budgets_data or "No budgets",
-                        "GKE Cluster Status": gke_data_summary or "No clusters",
-                    }
-                )
+        # Large write buffer: rows are small, so flush to disk in few syscalls
+        with open(output_filename, "w", newline="", buffering=1 << 20) as csvfile:
+            write_csv(csvfile, data, previous_period_dates, current_period_dates)
         console.print(
             f"[bright_green]Exported dashboard data to {os.path.abspath(output_filename)}[/]"
         )
@@ -263,8 +353,31 @@ def export_to_csv(
 
 
 # Placeholder for JSON export (needs updated data structure)
+def _encode_json(obj: Any) -> bytes:
+    """Serialize one value to indented JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        # orjson encodes straight to bytes and serializes dataclasses natively, without
+        # an intermediate asdict() copy; only 2-space indentation is supported
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    # The stdlib encoder converts dataclasses (ProjectData, GKESummary) via asdict()
+    return json.dumps(obj, indent=2, default=dataclasses.asdict).encode()
+
+
+def write_json(jsonfile: BinaryIO, data: Iterable[ProjectData]) -> None:
+    """Write dashboard rows as a JSON array to an open binary file, one row at a time."""
+    # TODO: Ensure 'data' structure matches GCP/GKE fields
+    # Rows are serialized and written one at a time inside a hand-written array,
+    # so the whole export never has to exist as a single encoded document
+    separator = b"[\n"
+    for row in data:
+        jsonfile.write(separator)
+        jsonfile.write(_encode_json(row))
+        separator = b",\n"
+    jsonfile.write(b"[]\n" if separator == b"[\n" else b"\n]\n")
+
+
 def export_to_json(
-    data: List[ProjectData], filename: str, output_dir: Optional[str] = None
+    data: Iterable[ProjectData], filename: str, output_dir: Optional[str] = None
 ) -> Optional[str]:
     """Placeholder: Export dashboard data to a JSON file."""
     console.print("[bold yellow]Placeholder: export_to_json not implemented[/]")
@@ -278,9 +391,8 @@ def export_to_json(
         else:
             output_filename = base_filename
 
-        # TODO: Ensure 'data' structure matches GCP/GKE fields
-        with open(output_filename, "w") as jsonfile:
-            json.dump(data, jsonfile, indent=4)
+        with open(output_filename, "wb") as jsonfile:
+            write_json(jsonfile, data)
 
         console.print(
             f"[bright_green]Exported dashboard data to {os.path.abspath(output_filename)}[/]"
@@ -288,4 +400,4 @@ def export_to_json(
         return os.path.abspath(output_filename)
     except Exception as e:
         console.print(f"[bold red]Error exporting to JSON: {str(e)}[/]")
-        return None
\ No newline at end of file
+        return None
@@ -1,37 +1,126 @@
 import argparse
+import asyncio
+import logging
+import logging.handlers
 import sys
-from collections import defaultdict
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import google.auth
 from rich import box
-from rich.console import Console
+from rich.console import Console, Group
+from rich.live import Live
 from rich.table import Column, Table
-from rich.progress import Progress, track
-from rich.status import Status
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+)
 
 # Updated import paths and names
 from gke_finops_dashboard.gcp_client import (
+    close_clients,
+    get_gcp_projects,
     get_gke_summary, # Renamed from ec2_summary
     get_billing_account_for_project, # New function
+    verify_credentials,
 )
 from gke_finops_dashboard.gcp_cost_processor import ( # Updated module name
     export_to_csv,
     export_to_json,
+    format_cents,
     format_gcp_budget_info, # Renamed from format_budget_info
     format_gke_summary, # Renamed from format_ec2_summary
     get_gcp_cost_data, # Renamed from get_cost_data
+    get_period_window,
     process_gcp_costs, # Renamed from process_service_costs
 )
 # Updated import path and type names (will define/refactor these later)
-from gke_finops_dashboard.types import GCPBudgetInfo, ProjectData, GCPCostData
+from gke_finops_dashboard.types import GCPCostData, GKESummary, ProjectData
 
 console = Console()
+logger = logging.getLogger(__name__)
+
+# Upper bound on projects processed at once; each project fans out into several RPCs
+MAX_CONCURRENT_PROJECTS = 16
+
+# Warnings raised while projects are fetched concurrently are buffered here and
+# written to the console in one batch once fetching is done.
+_log_buffer: Optional[logging.handlers.MemoryHandler] = None
+
+
+def _configure_logging() -> logging.handlers.MemoryHandler:
+    """Route the package's WARNING+ log records to the console through a buffer."""
+    global _log_buffer
+    if _log_buffer is None:
+        from rich.logging import RichHandler
+
+        _log_buffer = logging.handlers.MemoryHandler(
+            capacity=10_000,
+            flushLevel=logging.CRITICAL,
+            target=RichHandler(console=console, show_time=False, show_path=False),
+        )
+        package_logger = logging.getLogger("gke_finops_dashboard")
+        package_logger.setLevel(logging.WARNING)
+        package_logger.addHandler(_log_buffer)
+        package_logger.propagate = False
+    return _log_buffer
+
+
+# Fields shared by every failed project's ProjectData
+_ERROR_PROJECT_TEMPLATE: Dict[str, Any] = {
+    "previous_period_cents": 0, "current_period_cents": 0,
+    "success": False,
+    "current_period_name": "Current Period", "previous_period_name": "Previous Period",
+    "current_period_start": "N/A", "current_period_end": "N/A",
+    "previous_period_start": "N/A", "previous_period_end": "N/A",
+}
+
+
+def _make_error_project_data(project_id: str, error_msg: str, label: str = "Error") -> ProjectData:
+    """Build the ProjectData row shown for a project that could not be processed."""
+    return ProjectData(
+        **_ERROR_PROJECT_TEMPLATE,
+        project_id=project_id,
+        service_costs=[],
+        service_costs_formatted=error_msg,
+        budget_info=label,
+        gke_summary=GKESummary(),
+        gke_summary_formatted=label,
+        error=error_msg,
+    )
 
 
 # --- Functions below will be completely refactored for GCP ---
 
+def _empty_cost_data(project_id: str, time_range: Optional[int]) -> GCPCostData:
+    """Build the cost data of a project without a billing account (no costs or budgets)."""
+    return GCPCostData(
+        project_id=project_id, current_period_cents=0, previous_period_cents=0,
+        cost_by_service=[], budgets=[], current_period_name="Current Period",
+        previous_period_name="Previous Period", time_range=time_range,
+        current_period_start="N/A", current_period_end="N/A",
+        previous_period_start="N/A", previous_period_end="N/A",
+    )
+
+
+async def _get_project_cost_data(
+    project_id: str, time_range: Optional[int] = None
+) -> GCPCostData:
+    """Resolve the project's billing account and fetch its cost and budget data."""
+    # Get billing account
+    billing_account_name = await get_billing_account_for_project(project_id)
+    if not billing_account_name:
+         # Handle case where billing account couldn't be determined (e.g., no permissions, billing disabled)
+         # We can still try to get GKE data, but cost/budget will be unavailable.
+         logger.warning("Could not determine billing account for %s. Cost and budget data will be unavailable.", project_id)
+         return _empty_cost_data(project_id, time_range)
+    # Get cost and budget data (uses budget proxy for cost)
+    return await get_gcp_cost_data(project_id, billing_account_name, time_range)
+
+
 # Placeholder for processing a single GCP project
-def process_single_project(
+async def process_single_project(
     project_id: str,
     user_locations: Optional[List[str]] = None,
     time_range: Optional[int] = None,
@@ -39,83 +128,51 @@ def process_single_project(
     """Process a single GCP project and return its data."""
     # console.print(f"[bold yellow]Placeholder: process_single_project({project_id}, {user_locations}, {time_range}) not implemented[/]") # Removed placeholder
     try:
-        # Get billing account
-        billing_account_name = get_billing_account_for_project(project_id)
-        if not billing_account_name:
-             # Handle case where billing account couldn't be determined (e.g., no permissions, billing disabled)
-             # We can still try to get GKE data, but cost/budget will be unavailable.
-             console.log(f"[yellow]Could not determine billing account for {project_id}. Cost and budget data will be unavailable.[/]")
-             cost_data: GCPCostData = { # Create dummy cost data
-                 "project_id": project_id, "current_period_cost": 0.0, "previous_period_cost": 0.0,
-                 "cost_by_service": [], "budgets": [], "current_period_name": "Current Period",
-                 "previous_period_name": "Previous Period", "time_range": time_range,
-                 "current_period_start": "N/A", "current_period_end": "N/A",
-                 "previous_period_start": "N/A", "previous_period_end": "N/A",
-             }
-        else:
-            # Get cost and budget data (uses budget proxy for cost)
-            cost_data = get_gcp_cost_data(project_id, billing_account_name, time_range)
-
-        # Get GKE data - pass user_locations (which can be None to check all)
-        gke_data = get_gke_summary(project_id, user_locations)
+        # Billing/cost lookups and GKE listing are independent, so run them concurrently.
+        # GKE data - pass user_locations (which can be None to check all)
+        cost_data, gke_data = await asyncio.gather(
+            _get_project_cost_data(project_id, time_range),
+            get_gke_summary(project_id, user_locations),
+        )
 
         # Process costs (currently just total cost proxy)
         service_costs_formatted, service_cost_data = process_gcp_costs(cost_data)
 
         # Format budgets
-        budget_info_formatted = format_gcp_budget_info(cost_data["budgets"])
+        budget_info_formatted = format_gcp_budget_info(cost_data.budgets)
 
         # Format GKE summary
         gke_summary_formatted = format_gke_summary(gke_data)
 
-        return {
-            "project_id": project_id,
-            "previous_period_cost": cost_data["previous_period_cost"],
-            "current_period_cost": cost_data["current_period_cost"],
-            "service_costs": service_cost_data,
-            "service_costs_formatted": service_costs_formatted,
-            "budget_info": budget_info_formatted, # This now holds the formatted strings
-            "gke_summary": gke_data, # Raw summary data
-            "gke_summary_formatted": gke_summary_formatted, # Formatted strings
-            "success": True,
-            "error": None,
-            "current_period_name": cost_data.get("current_period_name", "Current Period"),
-            "previous_period_name": cost_data.get("previous_period_name", "Previous Period"),
+        return ProjectData(
+            project_id=project_id,
+            previous_period_cents=cost_data.previous_period_cents,
+            current_period_cents=cost_data.current_period_cents,
+            service_costs=service_cost_data,
+            # Formatted lines are joined once here rather than on every render/export
+            service_costs_formatted="\n".join(service_costs_formatted),
+            budget_info="\n".join(budget_info_formatted),
+            gke_summary=gke_data, # Raw summary data
+            gke_summary_formatted="\n".join(gke_summary_formatted),
+            current_period_name=cost_data.current_period_name,
+            previous_period_name=cost_data.previous_period_name,
             # Include dates for potential use in table headers/exports
-            "current_period_start": cost_data.get("current_period_start", "N/A"),
-            "current_period_end": cost_data.get("current_period_end", "N/A"),
-            "previous_period_start": cost_data.get("previous_period_start", "N/A"),
-            "previous_period_end": cost_data.get("previous_period_end", "N/A"),
-        }
+            current_period_start=cost_data.current_period_start,
+            current_period_end=cost_data.current_period_end,
+            previous_period_start=cost_data.previous_period_start,
+            previous_period_end=cost_data.previous_period_end,
+        )
 
     except google.auth.exceptions.DefaultCredentialsError:
-         # Catch auth errors specifically
-         error_msg = "GCP authentication failed. Run 'gcloud auth application-default login'."
-         console.print(f"[bold red]Authentication Error processing project {project_id}.[/]")
-         # Return structure indicating failure
-         return {
-            "project_id": project_id, "previous_period_cost": 0, "current_period_cost": 0,
-            "service_costs": [], "service_costs_formatted": [error_msg],
-            "budget_info": ["Auth Error"], "gke_summary": {}, "gke_summary_formatted": ["Auth Error"],
-            "success": False, "error": error_msg,
-            "current_period_name": "Current Period", "previous_period_name": "Previous Period",
-            "current_period_start": "N/A", "current_period_end": "N/A",
-            "previous_period_start": "N/A", "previous_period_end": "N/A",
-         }
+         # Re-raised so _process_projects can cancel the remaining projects;
+         # _to_project_data turns it into the project's "Auth Error" row
+         logger.error("Authentication Error processing project %s.", project_id)
+         raise
     except Exception as e:
         # Catch all other errors during processing
         error_msg = f"Failed to process project: {str(e)}"
-        console.print(f"[bold red]Error processing project {project_id}: {error_msg}[/]")
-        # Return structure indicating failure
-        return {
-            "project_id": project_id, "previous_period_cost": 0, "current_period_cost": 0,
-            "service_costs": [], "service_costs_formatted": [error_msg],
-            "budget_info": ["Error"], "gke_summary": {}, "gke_summary_formatted": ["Error"],
-            "success": False, "error": str(e),
-            "current_period_name": "Current Period", "previous_period_name": "Previous Period",
-            "current_period_start": "N/A", "current_period_end": "N/A",
-            "previous_period_start": "N/A", "previous_period_end": "N/A",
-        }
+        logger.error("Error processing project %s: %s", project_id, error_msg)
+        return _make_error_project_data(project_id, error_msg)
 
 
 # Removed process_combined_profiles as --combine flag is removed
@@ -130,13 +187,14 @@ def create_display_table(
 ) -> Table:
     """Create and configure the display table for GCP/GKE data."""
     # console.print("[bold yellow]Placeholder: create_display_table needs GCP/GKE columns[/]") # Removed placeholder
+    # Columns are built per call: a Column holds its table's cells, so one can't be shared between tables
     table = Table(
         "GCP Project ID",
         Column(f"{previous_period_name} Cost\n({previous_period_dates})", justify="right"), # Right align costs
         Column(f"{current_period_name} Cost\n({current_period_dates})", justify="right"), # Right align costs
-        Column("Total Cost (Proxy)"), # Display the proxy cost
-        Column("Budget Status"),
-        Column("GKE Cluster Summary", justify="left"), # Left align summary text
+        Column("Total Cost (Proxy)", overflow="fold"), # Display the proxy cost
+        Column("Budget Status", overflow="fold"),
+        Column("GKE Cluster Summary", justify="left", overflow="fold"), # Left align summary text
         title="GKE FinOps Dashboard",
         caption="GKE FinOps Dashboard CLI - Costs are approximated based on budget data.", # Added caption note
         box=box.ASCII_DOUBLE_HEAD,
@@ -151,128 +209,191 @@ def create_display_table(
     return table
 
 
-# Placeholder: Add project data to table
-def add_project_to_table(table: Table, project_data: ProjectData) -> None:
-    """Add project data to the display table."""
-    # console.print("[bold yellow]Placeholder: add_project_to_table needs GCP/GKE data mapping[/]") # Removed placeholder
-    if project_data["success"]:
-        # Join the formatted lists with newlines for multi-line cell content
-        cost_str = "\n".join(project_data["service_costs_formatted"])
-        budget_str = "\n".join(project_data["budget_info"])
-        gke_str = "\n".join(project_data["gke_summary_formatted"])
-
-        table.add_row(
-            f"[bright_magenta]{project_data['project_id']}[/]",
-            f"[bright_red]${project_data['previous_period_cost']:.2f}[/]", # Note: Likely $0.00
-            f"[bright_green]${project_data['current_period_cost']:.2f}[/]",
-            cost_str, # Display the formatted total cost proxy string
-            budget_str,
-            gke_str,
+def _row_tuple(project_data: ProjectData) -> Tuple[str, str, str, str, str, str]:
+    """Build the six display table cells for one project."""
+    if not project_data.success:
+        error_cell = "[red]Error[/]"
+        return (
+            f"[bright_magenta]{project_data.project_id}[/]",
+            error_cell,
+            error_cell,
+            f"[red]{project_data.error or 'Unknown Error'}[/]",
+            error_cell,
+            error_cell,
         )
-    else:
-        # Display error row
-        error_msg = project_data.get('error', 'Unknown Error')
-        table.add_row(
-            f"[bright_magenta]{project_data['project_id']}[/]",
-            "[red]Error[/]",
-            "[red]Error[/]",
-            f"[red]{error_msg}[/]",
-            "[red]Error[/]",
-            "[red]Error[/]",
+    return (
+        f"[bright_magenta]{project_data.project_id}[/]",
+        f"[bright_red]{format_cents(project_data.previous_period_cents)}[/]", # Note: Likely $0.00
+        f"[bright_green]{format_cents(project_data.current_period_cents)}[/]",
+        project_data.service_costs_formatted, # Display the formatted total cost proxy string
+        project_data.budget_info,
+        project_data.gke_summary_formatted,
+    )
+
+
+async def _process_project_bounded(
+    semaphore: asyncio.Semaphore,
+    index: int,
+    project_id: str,
+    user_locations: Optional[List[str]] = None,
+    time_range: Optional[int] = None,
+) -> Tuple[int, Union[ProjectData, Exception]]:
+    """Process one project under the concurrency cap, returning its index and result or error."""
+    async with semaphore:
+        try:
+            return index, await process_single_project(project_id, user_locations, time_range)
+        except Exception as e:
+            return index, e
+
+
+async def _process_projects(
+    projects: List[str],
+    user_locations: Optional[List[str]] = None,
+    time_range: Optional[int] = None,
+    on_project_done: Optional[Callable[[str, Union[ProjectData, Exception]], None]] = None,
+) -> List[Tuple[str, Union[ProjectData, Exception]]]:
+    """Process all projects concurrently, returning (project_id, result or error) pairs in input order.
+
+    on_project_done, if given, is called with each project's result as soon as it completes.
+    An authentication failure cancels every project still pending, since they would all fail
+    the same way; cancelled projects are left out of the returned pairs.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PROJECTS)
+    tasks = [
+        asyncio.ensure_future(
+            _process_project_bounded(semaphore, index, project_id, user_locations, time_range)
         )
+        for index, project_id in enumerate(projects)
+    ]
+    # Each task writes its own slot, so results land in input order as they complete
+    results: List[Optional[Union[ProjectData, Exception]]] = [None] * len(projects)
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, result = await next_done
+            results[index] = result
+            if on_project_done is not None:
+                on_project_done(projects[index], result)
+            if isinstance(result, google.auth.exceptions.DefaultCredentialsError):
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Clients are bound to this event loop, which asyncio.run closes after this run
+        await close_clients()
+    return [
+        (project_id, result)
+        for project_id, result in zip(projects, results)
+        if result is not None
+    ]
+
+
+def _to_project_data(project_id: str, result: Union[ProjectData, Exception]) -> ProjectData:
+    """Turn a project's result, or the error it raised, into its display/export row."""
+    if isinstance(result, google.auth.exceptions.DefaultCredentialsError):
+        # Handle auth error raised from process_single_project
+        error_msg = "GCP authentication failed. Run 'gcloud auth application-default login'."
+        return _make_error_project_data(project_id, error_msg, label="Auth Error")
+    if isinstance(result, Exception):
+        logger.error("Unexpected error processing project %s: %s", project_id, result)
+        return _make_error_project_data(project_id, f"Unexpected error: {result}")
+    return result
+
+
+# Report exporters by --report-type value
+EXPORTERS: Dict[str, Callable[..., Optional[str]]] = {
+    "csv": export_to_csv,
+    "json": export_to_json,
+}
 
 
 # Placeholder: Main dashboard logic for GCP
 def run_dashboard(args: argparse.Namespace) -> int:
     """Main function to run the GKE FinOps dashboard."""
     # console.print("[bold yellow]Placeholder: run_dashboard needs GCP logic[/]") # Removed placeholder
-    export_data: List[ProjectData] = []
-    first_project_data: Optional[ProjectData] = None # To store data from first successful project for headers
 
-    # Validate projects argument
-    projects_to_use = args.projects
+    # Validate projects argument (falls back to the GKE_FINOPS_PROJECTS env var)
+    projects_to_use = get_gcp_projects(args.projects)
     if not projects_to_use:
-         console.print("[bold red]No GCP projects specified. Use the --projects argument.[/]")
+         console.print("[bold red]No GCP projects specified. Use the --projects argument or set GKE_FINOPS_PROJECTS.[/]")
          return 1
+    # Drop repeated project IDs (keeping first-seen order) so no project is fetched twice
+    unique_projects = list(dict.fromkeys(projects_to_use))
+    if len(unique_projects) != len(projects_to_use):
+        console.print(f"[yellow]Ignoring {len(projects_to_use) - len(unique_projects)} duplicate project ID(s).[/]")
+        projects_to_use = unique_projects
+
+    # Check credentials once up front; the refreshed token is shared by all clients
+    try:
+        verify_credentials()
+    except google.auth.exceptions.GoogleAuthError as e:
+        console.print(f"[bold red]GCP authentication failed: {e}. Run 'gcloud auth application-default login'.[/]")
+        return 1
 
     user_locations = args.locations
     time_range = args.time_range
 
+    # Headers come from the reporting window, so the table can be shown before any data arrives
+    period = get_period_window(time_range)
+    previous_period_dates = f"{period.previous_period_start} to {period.previous_period_end}"
+    current_period_dates = f"{period.current_period_start} to {period.current_period_end}"
+    table_headers = (
+        previous_period_dates, current_period_dates, period.previous_period_name, period.current_period_name
+    )
+    table = create_display_table(*table_headers)
+    add_row = table.add_row
+
+    progress = Progress(
+        SpinnerColumn(),
+        TextColumn("[bright_cyan]Fetching GCP data..."),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+    )
+    fetch_task = progress.add_task("fetch", total=len(projects_to_use))
+    project_rows: Dict[str, ProjectData] = {}
+
+    def show_project(project_id: str, result: Union[ProjectData, Exception]) -> None:
+        # The live view gets rows as projects finish, in completion order
+        project_data = project_rows[project_id] = _to_project_data(project_id, result)
+        add_row(*_row_tuple(project_data))
+        progress.advance(fetch_task)
+
     # Process projects
     console.print(f"[cyan]Processing {len(projects_to_use)} GCP project(s)...[/]")
-    auth_error_encountered = False
-    for project_id in track(projects_to_use, description="[bright_cyan]Fetching GCP data..."):
-        try:
-            project_data = process_single_project(project_id, user_locations, time_range)
-            export_data.append(project_data)
-            if project_data["success"] and first_project_data is None:
-                first_project_data = project_data # Store first success for headers
-        except google.auth.exceptions.DefaultCredentialsError:
-             # Handle auth error raised from process_single_project
-             auth_error_encountered = True
-             # Create error entry for export
-             error_msg = "GCP authentication failed. Run 'gcloud auth application-default login'."
-             export_data.append({
-                 "project_id": project_id, "previous_period_cost": 0, "current_period_cost": 0,
-                 "service_costs": [], "service_costs_formatted": [error_msg],
-                 "budget_info": ["Auth Error"], "gke_summary": {}, "gke_summary_formatted": ["Auth Error"],
-                 "success": False, "error": error_msg,
-                 "current_period_name": "Current Period", "previous_period_name": "Previous Period",
-                 "current_period_start": "N/A", "current_period_end": "N/A",
-                 "previous_period_start": "N/A", "previous_period_end": "N/A",
-             })
-             # Stop processing further projects on auth error
-             console.print("[bold red]Authentication failed. Aborting further processing.[/]")
-             break
-        except Exception as e:
-             # Handle unexpected errors during the loop itself (less likely)
-             console.print(f"[bold red]Unexpected error processing project {project_id}: {e}[/]")
-             error_msg = f"Unexpected error: {str(e)}"
-             export_data.append({
-                 "project_id": project_id, "previous_period_cost": 0, "current_period_cost": 0,
-                 "service_costs": [], "service_costs_formatted": [error_msg],
-                 "budget_info": ["Error"], "gke_summary": {}, "gke_summary_formatted": ["Error"],
-                 "success": False, "error": error_msg,
-                 "current_period_name": "Current Period", "previous_period_name": "Previous Period",
-                 "current_period_start": "N/A", "current_period_end": "N/A",
-                 "previous_period_start": "N/A", "previous_period_end": "N/A",
-             })
-
-    # Determine headers from first successful project or use defaults
-    if first_project_data:
-        previous_period_name = first_project_data.get("previous_period_name", "Previous Period")
-        current_period_name = first_project_data.get("current_period_name", "Current Period")
-        previous_period_dates = f"{first_project_data.get('previous_period_start', 'N/A')} to {first_project_data.get('previous_period_end', 'N/A')}"
-        current_period_dates = f"{first_project_data.get('current_period_start', 'N/A')} to {first_project_data.get('current_period_end', 'N/A')}"
-    else:
-        # Use defaults if no project succeeded or auth failed immediately
-        previous_period_name = "Previous Period"
-        current_period_name = "Current Period"
-        previous_period_dates = "N/A"
-        current_period_dates = "N/A"
-
-    # Create and populate the table
-    table = create_display_table(previous_period_dates, current_period_dates, previous_period_name, current_period_name)
-    for data in export_data:
-        add_project_to_table(table, data)
-
-    console.print(table)
+    log_buffer = _configure_logging()
+    with Live(Group(table, progress), console=console, refresh_per_second=4) as live:
+        results = asyncio.run(
+            _process_projects(projects_to_use, user_locations, time_range, on_project_done=show_project)
+        )
+        # The finished dashboard and the exports list projects in input order
+        export_data = [project_rows[project_id] for project_id, _ in results]
+        final_table = create_display_table(*table_headers)
+        add_final_row = final_table.add_row
+        for project_data in export_data:
+            add_final_row(*_row_tuple(project_data))
+        live.update(final_table)
+    log_buffer.flush()
+    auth_error_encountered = any(
+        isinstance(result, google.auth.exceptions.DefaultCredentialsError) for _, result in results
+    )
+    if auth_error_encountered:
+        console.print("[bold red]Authentication failed. Aborting further processing.[/]")
 
     # Export if requested
-    if args.report_name and args.report_type:
+    requested = [report_type for report_type in args.report_type or () if report_type in EXPORTERS]
+    if args.report_name and requested:
         console.print("[cyan]Exporting data...[/]")
-        # Pass the actual dates used in the table headers to the export functions
+        # Pass the actual dates used in the table headers to the CSV export (JSON has no headers)
         export_kwargs = {
             "previous_period_dates": previous_period_dates,
             "current_period_dates": current_period_dates,
         }
-        for report_type in args.report_type:
-            if report_type == "csv":
-                csv_path = export_to_csv(export_data, args.report_name, args.dir, **export_kwargs)
-                # Output handled within export_to_csv
-            elif report_type == "json":
-                json_path = export_to_json(export_data, args.report_name, args.dir)
-                # Output handled within export_to_json
+        for report_type in requested:
+            # Output handled within each exporter
+            EXPORTERS[report_type](
+                export_data, args.report_name, args.dir, **(export_kwargs if report_type == "csv" else {})
+            )
 
     # Return non-zero exit code if auth failed
     return 1 if auth_error_encountered else 0
@@ -1,24 +1,33 @@
 """Type definitions for GKE FinOps Dashboard."""
 
-from typing import Dict, List, Optional, Tuple, TypedDict, Any # Added Any
+import sys
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple, TypedDict # Added Any
+
+# slots=True is only accepted from Python 3.10; older interpreters get plain dataclasses
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 # Renamed from BudgetInfo
-class GCPBudgetInfo(TypedDict):
+@dataclass(**_SLOTS)
+class GCPBudgetInfo:
     """Type for a GCP budget entry."""
     name: str
-    limit: float
-    actual: float # Note: Actual spend might need separate calculation depending on API
-    forecast: Optional[float]
+    # Amounts are whole cents, rounded once from the API's Money values
+    limit_cents: int
+    actual_cents: int # Note: Actual spend might need separate calculation depending on API
+    forecast_cents: Optional[int]
     # Add other relevant GCP budget fields if needed
 
 
 # Renamed from CostData
-class GCPCostData(TypedDict):
+@dataclass(**_SLOTS)
+class GCPCostData:
     """Type for cost data returned from GCP Billing API."""
     project_id: str # Changed from account_id
-    current_period_cost: float # Renamed from current_month
-    previous_period_cost: float # Renamed from last_month
+    current_period_cents: int # Renamed from current_month; whole cents
+    previous_period_cents: int # Renamed from last_month; whole cents
     cost_by_service: List[Dict[str, Any]] # Renamed, structure might change (or be empty if only total cost)
     budgets: List[GCPBudgetInfo] # Use renamed type
     current_period_name: str
@@ -30,22 +39,56 @@ class GCPCostData(TypedDict):
     previous_period_end: str
 
 
+@dataclass(frozen=True)
+class PeriodWindow:
+    """Current and previous reporting periods for a cost query."""
+    current_period_name: str
+    previous_period_name: str
+    current_period_start: date
+    current_period_end: date
+    previous_period_start: date
+    previous_period_end: date
+
+
+@dataclass(**_SLOTS)
+class GKESummary:
+    """GKE cluster counts per status (renamed from EC2Summary).
+
+    Field names are the lower-cased container_v1.Cluster.Status names, plus
+    permission_denied for projects whose clusters could not be listed.
+    """
+    running: int = 0
+    provisioning: int = 0
+    reconciling: int = 0
+    stopping: int = 0
+    degraded: int = 0
+    error: int = 0
+    status_unspecified: int = 0
+    permission_denied: int = 0
+
+
 # Renamed from ProfileData
-class ProjectData(TypedDict):
+@dataclass(**_SLOTS)
+class ProjectData:
     """Type for processed project data."""
     project_id: str # Changed from profile
     # account_id: str # Removed, project_id is the primary identifier
-    previous_period_cost: float # Renamed from last_month
-    current_period_cost: float # Renamed from current_month
-    service_costs: List[Tuple[str, float]] # Structure might change (e.g., just total cost)
-    service_costs_formatted: List[str] # Structure might change
-    budget_info: List[str] # Formatted budget strings
-    gke_summary: Dict[str, int] # Renamed from ec2_summary
-    gke_summary_formatted: List[str] # Renamed from ec2_summary_formatted
-    success: bool
-    error: Optional[str]
+    previous_period_cents: int # Renamed from last_month; whole cents
+    current_period_cents: int # Renamed from current_month; whole cents
+    service_costs: List[Tuple[str, int]] # (name, cents); structure might change (e.g., just total cost)
+    service_costs_formatted: str # Formatted cost lines, newline-joined for display
+    budget_info: str # Formatted budget lines, newline-joined for display
+    gke_summary: GKESummary # Renamed from ec2_summary
+    gke_summary_formatted: str # Renamed from ec2_summary_formatted; newline-joined lines
     current_period_name: str
     previous_period_name: str
+    current_period_start: str
+    current_period_end: str
+    previous_period_start: str
+    previous_period_end: str
+    # Defaults describe a successful project; failed ones set both
+    success: bool = True
+    error: Optional[str] = None
 
 
 # Updated CLIArgs
@@ -62,5 +105,4 @@ class CLIArgs(TypedDict, total=False):
 
 
 # Renamed type aliases
-LocationName = str
-GKESummary = Dict[str, int] # Renamed from EC2Summary
\ No newline at end of file
+LocationName = str
\ No newline at end of file
@@ -0,0 +1,33 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, List
+
+from google.cloud import container_v1
+
+from gke_finops_dashboard import gcp_client
+
+
+class FakeContainerClient:
+    """Returns the same clusters for every list_clusters call."""
+
+    def __init__(self, clusters: List[Any]) -> None:
+        self.clusters = clusters
+
+    async def list_clusters(self, **kwargs: Any) -> Any:
+        return SimpleNamespace(clusters=self.clusters)
+
+
+def test_region_filter_keeps_zonal_clusters_of_the_region(monkeypatch) -> None:
+    """Requesting a region counts the regional cluster and the clusters in its zones."""
+    running = container_v1.Cluster.Status.RUNNING
+    clusters = [
+        SimpleNamespace(name="regional", location="us-central1", status=running),
+        SimpleNamespace(name="zonal", location="us-central1-a", status=running),
+        SimpleNamespace(name="other-region", location="us-east1", status=running),
+        SimpleNamespace(name="other-zone", location="us-east1-b", status=running),
+    ]
+    monkeypatch.setattr(gcp_client, "get_container_client", lambda: FakeContainerClient(clusters))
+
+    summary = asyncio.run(gcp_client.get_gke_summary("project-0", ["us-central1"]))
+
+    assert summary.running == 2
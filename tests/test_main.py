@@ -0,0 +1,46 @@
+import argparse
+import asyncio
+from typing import List, Optional
+
+import google.auth.exceptions
+
+from gke_finops_dashboard import main
+
+
+def test_auth_failure_cancels_pending_projects(monkeypatch) -> None:
+    """One credentials failure cancels the projects still running and exits with 1."""
+    project_ids = [f"project-{i}" for i in range(40)]
+    started: List[str] = []
+    cancelled: List[str] = []
+
+    async def fake_process_single_project(
+        project_id: str,
+        user_locations: Optional[List[str]] = None,
+        time_range: Optional[int] = None,
+    ) -> main.ProjectData:
+        started.append(project_id)
+        if project_id == "project-0":
+            raise google.auth.exceptions.DefaultCredentialsError("no credentials")
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(project_id)
+            raise
+        raise AssertionError("pending project was not cancelled")
+
+    monkeypatch.setattr(main, "process_single_project", fake_process_single_project)
+    monkeypatch.setattr(main, "verify_credentials", lambda: None)
+    args = argparse.Namespace(
+        projects=project_ids,
+        locations=None,
+        time_range=None,
+        report_name=None,
+        report_type=None,
+        dir=None,
+    )
+
+    assert main.run_dashboard(args) == 1
+    # Projects queued behind the concurrency cap never started, and every started
+    # project other than the failing one was cancelled
+    assert len(started) < len(project_ids)
+    assert sorted(cancelled) == sorted(set(started) - {"project-0"})